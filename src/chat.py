@@ -1,5 +1,5 @@
 from rich.console import Console
-from src.search import search
+from src.search import search_chunks
 
 console = Console()
 
@@ -13,7 +13,7 @@ def run_repl():
             break
 
         try:
-            results = search(query)
+            results = search_chunks(query, k=3)
         except Exception as e:
             console.print(f"[bold red]Error:[/bold red] {e}")
             continue
@@ -22,14 +22,12 @@ def run_repl():
             console.print("[yellow]No results found.[/yellow]\n")
             continue
 
-        top_three = results[:3]
-
-        for i, (question, answer, statement, original, dist, embed) in enumerate(top_three, 1):
+        for i, (chunk_id, question, answer, statement, original, dist, source) in enumerate(results, 1):
             console.print(f"[i]{i}.[/i] [bold cyan]Q:[/bold cyan] {question}")
             console.print(f"[bold green]A:[/bold green] {answer}")
             console.print(f"[magenta]Statement:[/magenta] {statement}")
             console.print(f"[dim]Original: {original}[/dim]")
-            console.print(f"[blue]Distance: {dist:.4f}\n[/blue]")
+            console.print(f"[blue]Distance: {dist:.4f} (chunk {chunk_id}, matched {source})\n[/blue]")
 
 if __name__ == "__main__":
     run_repl()
@@ -1,3 +1,4 @@
+import io
 import os
 import sys
 import psycopg2
@@ -25,13 +26,21 @@ def drop_tables(cur):
     cur.execute("DROP TABLE IF EXISTS chunk_relationships;")
     cur.execute("DROP TABLE IF EXISTS questions;")
     cur.execute("DROP TABLE IF EXISTS knowledge_chunks;")
+    cur.execute("DROP TABLE IF EXISTS documents;")
 
 def create_tables(cur):
     """Create the necessary tables for the knowledge base."""
+    cur.execute("""
+        CREATE TABLE documents (
+            id         TEXT PRIMARY KEY,
+            title      TEXT,
+            created_at TIMESTAMPTZ DEFAULT now()
+        );
+    """)
     cur.execute("""
         CREATE TABLE knowledge_chunks (
             id SERIAL PRIMARY KEY,
-            document_id          TEXT,
+            document_id          TEXT NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
             section              TEXT,
             original_sentence    TEXT,
             declarative_sentence TEXT,
@@ -45,18 +54,42 @@ def create_tables(cur):
         CREATE TABLE questions (
             id SERIAL PRIMARY KEY,
             chunk_id      INTEGER REFERENCES knowledge_chunks(id) ON DELETE CASCADE,
+            document_id   TEXT NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
             question      TEXT,
             emb_question  VECTOR(384)
         );
     """)
+    # Every foreign key gets an index so a document can be scoped in search
+    # and deleted (with its cascades) without scanning whole tables.
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_knowledge_chunks_document
+        ON knowledge_chunks (document_id, section);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_questions_document
+        ON questions (document_id);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_questions_chunk
+        ON questions (chunk_id);
+    """)
     cur.execute("""
         CREATE TABLE chunk_relationships (
             id SERIAL PRIMARY KEY,
             source_chunk_id INTEGER REFERENCES knowledge_chunks(id) ON DELETE CASCADE,
             target_chunk_id INTEGER REFERENCES knowledge_chunks(id) ON DELETE CASCADE,
-            relation_type   TEXT
+            relation_type   TEXT,
+            score           REAL
         );
     """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chunk_relationships_source
+        ON chunk_relationships (source_chunk_id, relation_type, score DESC);
+    """)
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_chunk_relationships_target
+        ON chunk_relationships (target_chunk_id);
+    """)
 
 def create_vector_indexes(cur):
     cur.execute("""
@@ -77,6 +110,45 @@ def create_vector_indexes(cur):
     cur.execute("ANALYZE questions;")
     cur.execute("ANALYZE knowledge_chunks;")
 
+def parse_vector(text: str) -> list[float]:
+    """Parse a pgvector literal such as '[0.1,0.2]' into a list of floats."""
+    values = text.strip("[]")
+    return [float(v) for v in values.split(",")] if values else []
+
+def _copy_value(value) -> str:
+    if value is None:
+        return "\\N"
+    return (str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r"))
+
+def copy_rows(cur, table: str, columns: list[str], rows, page_size: int = 10000) -> int:
+    """
+    Bulk load `rows` into `table` with COPY, streaming `page_size` rows at a
+    time so large iterables never have to be held in memory. Returns the
+    number of rows written.
+    """
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN"
+    total = 0
+    buffer = io.StringIO()
+    count = 0
+    for row in rows:
+        buffer.write("\t".join(_copy_value(v) for v in row) + "\n")
+        count += 1
+        if count == page_size:
+            buffer.seek(0)
+            cur.copy_expert(sql, buffer)
+            total += count
+            buffer = io.StringIO()
+            count = 0
+    if count:
+        buffer.seek(0)
+        cur.copy_expert(sql, buffer)
+        total += count
+    return total
+
 def init_db():
     with connect() as conn:
         with conn.cursor() as cur:
@@ -96,25 +168,22 @@ def drop_db():
         conn.commit()
     print("🧹 All tables dropped.")
 
+def upsert_document(cur, document_id: str, title: str | None = None):
+    """Register a document so its chunks and questions can reference it."""
+    cur.execute("""
+        INSERT INTO documents (id, title)
+        VALUES (%s, %s)
+        ON CONFLICT (id) DO NOTHING;
+    """, (document_id, title))
+
 def delete_by_document_id(cur, document_id: str):
     """
-    Deletes all questions and knowledge_chunks associated with the given document_id.
+    Deletes the document and, through indexed ON DELETE CASCADE foreign keys,
+    all questions, knowledge_chunks and chunk_relationships belonging to it.
     """
-    # Delete questions first due to foreign key constraints
-    # query for questions by chunks with the given document_id
-    # and delete them
-    cur.execute("""
-        DELETE FROM questions
-        WHERE chunk_id IN (
-            SELECT id FROM knowledge_chunks
-            WHERE document_id = %s
-        );
-    """, (document_id,))
-
-    # Then delete chunks
     cur.execute("""
-        DELETE FROM knowledge_chunks
-        WHERE document_id = %s;
+        DELETE FROM documents
+        WHERE id = %s;
     """, (document_id,))
 
 def delete_document_data(document_id):
@@ -4,4 +4,8 @@ import numpy as np
 model = SentenceTransformer("all-MiniLM-L6-v2")
 
 def create_embedding(text: str) -> list[float]:
-    return model.encode(text, convert_to_numpy=True).tolist()
\ No newline at end of file
+    return model.encode(text, convert_to_numpy=True).tolist()
+
+def create_embeddings(texts: list[str], batch_size: int = 64) -> list[list[float]]:
+    """Embed a batch of texts in a single forward pass per `batch_size` texts."""
+    return model.encode(texts, batch_size=batch_size, convert_to_numpy=True).tolist()
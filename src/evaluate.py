@@ -0,0 +1,223 @@
+import sys
+import time
+import numpy as np
+
+from src.database import connect
+
+EMBEDDING_DIM = 384
+DEFAULT_K = 5
+DEFAULT_SAMPLE_SIZE = 500
+DEFAULT_RECALL_TARGET = 0.9
+
+# Chunk embedding columns a question can be evaluated against.
+FIELDS = {
+    "answer":      "emb_answer",
+    "declarative": "emb_declarative",
+}
+
+# Session-local copy of the chunk embeddings that candidate indexes are built
+# on, so the sweep never locks or alters knowledge_chunks itself.
+SCRATCH_TABLE = "eval_chunks"
+# Temporary tables are cached in per-session buffers (8MB by default); enlarge
+# them so latencies reflect memory-resident data rather than disk reads.
+TEMP_BUFFERS = "512MB"
+
+OPERATORS = {
+    "l2":     ("<->", "l2_ops"),
+    "cosine": ("<=>", "cosine_ops"),
+}
+
+QUANTIZATIONS = ["vector", "halfvec"]
+
+PROBES = [1, 5, 10, 20]
+EF_SEARCH = [20, 40, 100, 200]
+
+# (backend, index build parameters, query-time settings to sweep)
+INDEX_BUILDS = [
+    ("exact", {}, [{}]),
+    ("ivfflat", {"lists": 50}, [{"ivfflat.probes": p} for p in PROBES]),
+    ("ivfflat", {"lists": 100}, [{"ivfflat.probes": p} for p in PROBES]),
+    ("ivfflat", {"lists": 200}, [{"ivfflat.probes": p} for p in PROBES]),
+    ("hnsw", {"m": 16, "ef_construction": 64}, [{"hnsw.ef_search": ef} for ef in EF_SEARCH]),
+]
+
+# ---------- Metrics ----------
+
+def percentile(latencies: list[float], q: float) -> float:
+    return float(np.percentile(latencies, q)) if latencies else 0.0
+
+def summarize(hits: list[bool], latencies: list[float]) -> dict:
+    """Reduce per-query outcomes to recall@k and p50/p99 latency in milliseconds."""
+    return {
+        "recall": sum(hits) / len(hits) if hits else 0.0,
+        "p50": percentile(latencies, 50) * 1000,
+        "p99": percentile(latencies, 99) * 1000,
+    }
+
+def pick_fastest(results: list[dict], recall_target: float) -> dict | None:
+    """Return the result with the lowest p99 latency that still meets the recall target."""
+    eligible = [r for r in results if r["recall"] >= recall_target]
+    return min(eligible, key=lambda r: (r["p99"], r["p50"])) if eligible else None
+
+# ---------- Evaluation ----------
+
+def load_gold_set(cur, sample_size: int):
+    """
+    Sample stored questions as (chunk_id, question embedding) pairs. Every
+    question was generated from its chunk, so that chunk is the expected hit.
+    """
+    cur.execute("SELECT setseed(0.42);")
+    cur.execute("""
+        SELECT chunk_id, emb_question::text
+        FROM questions
+        WHERE emb_question IS NOT NULL
+        ORDER BY random()
+        LIMIT %s;
+    """, (sample_size,))
+    return cur.fetchall()
+
+def create_scratch_table(cur, field: str):
+    """
+    Copy the chunk ids and the evaluated embedding column into a temporary
+    table. Reading knowledge_chunks only takes the lock a normal SELECT does.
+    """
+    column = FIELDS[field]
+    cur.execute(f"SET temp_buffers = '{TEMP_BUFFERS}';")
+    cur.execute(f"DROP TABLE IF EXISTS {SCRATCH_TABLE};")
+    cur.execute(f"""
+        CREATE TEMPORARY TABLE {SCRATCH_TABLE} AS
+        SELECT id, {column} AS embedding
+        FROM knowledge_chunks
+        WHERE {column} IS NOT NULL;
+    """)
+    cur.execute(f"ANALYZE {SCRATCH_TABLE};")
+
+def build_index(cur, backend: str, params: dict, operator: str, quantization: str):
+    """
+    Build the configuration under test on the scratch table. Runs inside the
+    caller's transaction, which is rolled back afterwards to drop the index.
+    """
+    if backend == "exact":
+        return
+
+    expression = "embedding" if quantization == "vector" else f"(embedding::halfvec({EMBEDDING_DIM}))"
+    opclass = f"{quantization}_{OPERATORS[operator][1]}"
+    options = ", ".join(f"{name} = {value}" for name, value in params.items())
+    cur.execute(f"""
+        CREATE INDEX eval_embedding_index
+        ON {SCRATCH_TABLE} USING {backend} ({expression} {opclass})
+        WITH ({options});
+    """)
+    cur.execute(f"ANALYZE {SCRATCH_TABLE};")
+
+def run_queries(cur, gold, operator: str, quantization: str, k: int):
+    op = OPERATORS[operator][0]
+    if quantization == "vector":
+        distance = f"embedding {op} %s::vector"
+    else:
+        distance = f"embedding::halfvec({EMBEDDING_DIM}) {op} %s::halfvec({EMBEDDING_DIM})"
+    sql = f"SELECT id FROM {SCRATCH_TABLE} ORDER BY {distance} LIMIT %s;"
+
+    # Warm the cache so the first timed query is not an outlier.
+    cur.execute(sql, (gold[0][1], k))
+    cur.fetchall()
+
+    hits, latencies = [], []
+    for chunk_id, embedding in gold:
+        start = time.perf_counter()
+        cur.execute(sql, (embedding, k))
+        ids = [row[0] for row in cur.fetchall()]
+        latencies.append(time.perf_counter() - start)
+        hits.append(chunk_id in ids)
+    return hits, latencies
+
+def evaluate(k: int = DEFAULT_K, sample_size: int = DEFAULT_SAMPLE_SIZE, field: str = "answer"):
+    """
+    Sweep every backend, index parameter, operator and quantization setting,
+    measuring recall@k against the stored questions and the query latency of
+    each. Candidate indexes are built on a temporary copy of the embeddings,
+    so production tables and indexes are never locked beyond a plain read.
+    """
+    results = []
+    with connect() as conn:
+        with conn.cursor() as cur:
+            gold = load_gold_set(cur, sample_size)
+            if not gold:
+                return results
+            create_scratch_table(cur, field)
+        conn.commit()
+
+        for backend, build_params, search_settings in INDEX_BUILDS:
+            for operator in OPERATORS:
+                for quantization in QUANTIZATIONS:
+                    with conn.cursor() as cur:
+                        build_index(cur, backend, build_params, operator, quantization)
+                        for settings in search_settings:
+                            for name, value in settings.items():
+                                cur.execute(f"SET LOCAL {name} = {int(value)};")
+                            hits, latencies = run_queries(cur, gold, operator, quantization, k)
+                            params = {**build_params, **settings}
+                            results.append({
+                                "backend": backend,
+                                "operator": operator,
+                                "quantization": quantization,
+                                "params": ", ".join(f"{name}={value}" for name, value in params.items()) or "-",
+                                **summarize(hits, latencies),
+                            })
+                    conn.rollback()
+    return results
+
+# ---------- Entrypoint ----------
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_K
+    sample_size = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_SAMPLE_SIZE
+    recall_target = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_RECALL_TARGET
+    field = sys.argv[4] if len(sys.argv) > 4 else "answer"
+    if field not in FIELDS:
+        console.print("Usage: python -m src.evaluate [k] [sample_size] [recall_target] [answer|declarative]")
+        sys.exit(1)
+
+    with console.status("Evaluating search configurations..."):
+        results = evaluate(k, sample_size, field)
+
+    if not results:
+        console.print("[yellow]No questions found to evaluate with.[/yellow]")
+        sys.exit(1)
+
+    best = pick_fastest(results, recall_target)
+
+    table = Table(title=f"Recall@{k} vs latency ({field}, {sample_size} questions)")
+    table.add_column("Backend", style="cyan")
+    table.add_column("Operator")
+    table.add_column("Quantization")
+    table.add_column("Parameters", style="magenta")
+    table.add_column(f"Recall@{k}", justify="right", style="green")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p99 (ms)", justify="right")
+
+    for result in results:
+        table.add_row(
+            result["backend"],
+            result["operator"],
+            result["quantization"],
+            result["params"],
+            f"{result['recall']:.3f}",
+            f"{result['p50']:.2f}",
+            f"{result['p99']:.2f}",
+            style="bold" if result is best else None,
+        )
+
+    console.print(table)
+    if best:
+        console.print(
+            f"✅ Fastest configuration meeting recall@{k} >= {recall_target}: "
+            f"{best['backend']} ({best['params']}), {best['operator']}, {best['quantization']}"
+        )
+    else:
+        console.print(f"[yellow]No configuration reached recall@{k} >= {recall_target}.[/yellow]")
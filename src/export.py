@@ -0,0 +1,213 @@
+import os
+import sys
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.database import connect, copy_rows, parse_vector
+from src.relationships import build_relationships
+
+EMBEDDING_DIM = 384
+ROW_GROUP_SIZE = 10000
+FORMATS = {"parquet", "arrow"}
+
+VECTOR = pa.list_(pa.float32(), EMBEDDING_DIM)
+
+# Tables in dependency order, so an import never references a missing row.
+SCHEMAS = {
+    "documents": pa.schema([
+        ("id", pa.string()),
+        ("title", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ]),
+    "knowledge_chunks": pa.schema([
+        ("id", pa.int32()),
+        ("document_id", pa.string()),
+        ("section", pa.string()),
+        ("original_sentence", pa.string()),
+        ("declarative_sentence", pa.string()),
+        ("answer", pa.string()),
+        ("citations", pa.string()),
+        ("emb_declarative", VECTOR),
+        ("emb_answer", VECTOR),
+    ]),
+    "questions": pa.schema([
+        ("id", pa.int32()),
+        ("chunk_id", pa.int32()),
+        ("document_id", pa.string()),
+        ("question", pa.string()),
+        ("emb_question", VECTOR),
+    ]),
+}
+
+# ---------- Conversion ----------
+
+def vectors_to_arrow(texts: list[str | None], dim: int = EMBEDDING_DIM) -> pa.FixedSizeListArray:
+    """Convert pgvector literals into a fixed-size-list float32 array."""
+    values = np.zeros((len(texts), dim), dtype=np.float32)
+    nulls = np.array([text is None for text in texts], dtype=bool)
+    for i, text in enumerate(texts):
+        if text is not None:
+            values[i] = parse_vector(text)
+    return pa.FixedSizeListArray.from_arrays(pa.array(values.ravel()), dim, mask=pa.array(nulls))
+
+def rows_to_batch(rows: list[tuple], schema: pa.Schema) -> pa.RecordBatch:
+    """Build a record batch from database rows whose columns follow `schema`."""
+    columns = list(zip(*rows)) if rows else [[] for _ in schema]
+    arrays = []
+    for field, values in zip(schema, columns):
+        if field.type == VECTOR:
+            arrays.append(vectors_to_arrow(list(values)))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def batch_to_rows(batch: pa.RecordBatch):
+    """Yield COPY-ready rows from a record batch, formatting vectors as pgvector literals."""
+    columns = []
+    for field, column in zip(batch.schema, batch.columns):
+        if field.type == VECTOR:
+            columns.append(vector_literals(column))
+        elif pa.types.is_timestamp(field.type):
+            columns.append([None if v is None else v.isoformat() for v in column.to_pylist()])
+        else:
+            columns.append(column.to_pylist())
+    yield from zip(*columns)
+
+def vector_literals(column: pa.FixedSizeListArray) -> list[str | None]:
+    if column.null_count:
+        # flatten() drops the slots of null lists, so convert row by row instead.
+        return [None if v is None else "[" + ",".join(map(str, v)) + "]" for v in column.to_pylist()]
+    matrix = column.flatten().to_numpy().reshape(-1, EMBEDDING_DIM)
+    return ["[" + ",".join(map(str, row.tolist())) + "]" for row in matrix]
+
+# ---------- Reading ----------
+
+def read_table(path: str) -> pa.Table:
+    """
+    Open an exported file through a memory map. Arrow IPC files are read
+    zero-copy, Parquet files are decoded straight from the mapped pages.
+    """
+    if path.endswith(".arrow"):
+        return pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return pq.read_table(path, memory_map=True)
+
+def embedding_matrix(table: pa.Table, column: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Return an (n, dim) float32 view of an embedding column together with a
+    boolean mask of the rows that hold an embedding. Row i of the matrix is
+    always row i of the table; rows of NULL embeddings must not be used.
+    Columns stored in a single chunk are returned without copying.
+    """
+    blocks, masks = [], []
+    for chunk in table.column(column).chunks:
+        # Unlike flatten(), the child data buffer keeps a slot for every row,
+        # NULL or not; read it directly since readers may also mark those slots null.
+        values = chunk.values
+        start = (values.offset + chunk.offset * EMBEDDING_DIM) * 4
+        matrix = np.frombuffer(values.buffers()[1], dtype=np.float32, count=len(chunk) * EMBEDDING_DIM, offset=start)
+        blocks.append(matrix.reshape(-1, EMBEDDING_DIM))
+        masks.append(chunk.is_valid().to_numpy(zero_copy_only=False))
+    if len(blocks) == 1:
+        return blocks[0], masks[0]
+    if not blocks:
+        return np.empty((0, EMBEDDING_DIM), dtype=np.float32), np.empty(0, dtype=bool)
+    return np.concatenate(blocks), np.concatenate(masks)
+
+def iter_batches(path: str):
+    if path.endswith(".arrow"):
+        with pa.memory_map(path, "r") as source:
+            reader = pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                yield reader.get_batch(i)
+    else:
+        yield from pq.ParquetFile(path, memory_map=True).iter_batches()
+
+# ---------- Export / Import ----------
+
+def select_sql(table: str) -> str:
+    columns = [
+        f"{field.name}::text" if field.type == VECTOR or field.name == "citations" else field.name
+        for field in SCHEMAS[table]
+    ]
+    return f"SELECT {', '.join(columns)} FROM {table} ORDER BY {SCHEMAS[table][0].name};"
+
+def export_table(conn, table: str, path: str, row_group_size: int = ROW_GROUP_SIZE) -> int:
+    """
+    Stream `table` into `path` one row group at a time through a server-side
+    cursor, so only `row_group_size` rows are ever held in memory.
+    """
+    schema = SCHEMAS[table]
+    total = 0
+    with conn.cursor(name=f"export_{table}") as cur:
+        cur.itersize = row_group_size
+        cur.execute(select_sql(table))
+
+        if path.endswith(".arrow"):
+            writer = pa.ipc.new_file(path, schema)
+        else:
+            writer = pq.ParquetWriter(path, schema)
+        with writer:
+            while rows := cur.fetchmany(row_group_size):
+                batch = rows_to_batch(rows, schema)
+                if path.endswith(".arrow"):
+                    writer.write_batch(batch)
+                else:
+                    writer.write_batch(batch, row_group_size=row_group_size)
+                total += len(rows)
+    return total
+
+def export_tables(out_dir: str, fmt: str = "parquet", row_group_size: int = ROW_GROUP_SIZE) -> dict[str, int]:
+    os.makedirs(out_dir, exist_ok=True)
+    counts = {}
+    with connect() as conn:
+        for table in SCHEMAS:
+            counts[table] = export_table(conn, table, os.path.join(out_dir, f"{table}.{fmt}"), row_group_size)
+    return counts
+
+def import_tables(in_dir: str, fmt: str = "parquet") -> dict[str, int]:
+    """
+    Load exported files into an initialized, empty database with COPY, then
+    move the id sequences past the imported ids and rebuild the chunk graph.
+    """
+    counts = {}
+    with connect() as conn:
+        with conn.cursor() as cur:
+            for table, schema in SCHEMAS.items():
+                path = os.path.join(in_dir, f"{table}.{fmt}")
+                rows = (row for batch in iter_batches(path) for row in batch_to_rows(batch))
+                counts[table] = copy_rows(cur, table, schema.names, rows)
+
+            for table in ("knowledge_chunks", "questions"):
+                cur.execute(f"""
+                    SELECT setval(pg_get_serial_sequence('{table}', 'id'), COALESCE(MAX(id), 0) + 1, false)
+                    FROM {table};
+                """)
+            build_relationships(cur)
+        conn.commit()
+    return counts
+
+# ---------- Entrypoint ----------
+
+if __name__ == "__main__":
+    usage = "Usage: python -m src.export <export|import> <directory> [parquet|arrow]"
+    if len(sys.argv) < 3:
+        print(usage)
+        sys.exit(1)
+
+    command = sys.argv[1].lower()
+    directory = sys.argv[2]
+    fmt = sys.argv[3].lower() if len(sys.argv) > 3 else "parquet"
+    if fmt not in FORMATS:
+        print(usage)
+        sys.exit(1)
+
+    if command == "export":
+        counts = export_tables(directory, fmt)
+        print(f"✅ Exported {', '.join(f'{n} {table}' for table, n in counts.items())} to {directory}.")
+    elif command == "import":
+        counts = import_tables(directory, fmt)
+        print(f"✅ Imported {', '.join(f'{n} {table}' for table, n in counts.items())} from {directory}.")
+    else:
+        print(usage)
+        sys.exit(1)
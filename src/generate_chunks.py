@@ -6,6 +6,8 @@ import dspy
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
+from src.sentence_filter import SentenceFilter
+
 load_dotenv()
 
 MODEL = 'anthropic/claude-3-opus-20240229'
@@ -70,6 +72,7 @@ def load_sentences(json_path: str):
 
     sentences = data.get("sentences", [])
     total_chunks = 0
+    sentence_filter = SentenceFilter()
 
     # Get file base name for document_id
     document_id = os.path.splitext(os.path.basename(json_path))[0]
@@ -89,14 +92,17 @@ def load_sentences(json_path: str):
         for item in sentences:
             sentence = item.get("sentence", "")
             paragraph = item.get("paragraph", "")
-            result = chunk_knowledge(sentence, paragraph)
-            for chunk in result.chunks:
-                chunk_data = chunk.model_dump()
-                save_chunk_to_preview(document_id, item, chunk_data)
-                total_chunks += 1
+            # Skip boilerplate, fragments and duplicates before paying for an LLM call.
+            if sentence_filter.keep(sentence):
+                result = chunk_knowledge(sentence, paragraph)
+                for chunk in result.chunks:
+                    chunk_data = chunk.model_dump()
+                    save_chunk_to_preview(document_id, item, chunk_data)
+                    total_chunks += 1
 
             progress.update(task, advance=1)
 
+    print(f"⏭️ {sentence_filter.report()}")
     print(f"✅ Loaded {total_chunks} chunks from {len(sentences)} sentences.")
 
 # ---------- Entrypoint ----------
@@ -6,8 +6,9 @@ import dspy
 from pydantic import BaseModel
 from dotenv import load_dotenv
 
-from src.database import connect
+from src.database import connect, upsert_document
 from src.embedding import create_embedding
+from src.relationships import update_relationships
 
 load_dotenv()
 
@@ -66,14 +67,15 @@ def insert_knowledge_chunk(cur, document_id, section, original, declarative, ans
     """, (document_id, section, original, declarative, answer, json.dumps(citations), emb_decl, emb_ans))
     return cur.fetchone()[0]
 
-def insert_question(cur, chunk_id, question, emb_question):
+def insert_question(cur, document_id, chunk_id, question, emb_question):
     cur.execute("""
         INSERT INTO questions (
             chunk_id,
+            document_id,
             question,
             emb_question
-        ) VALUES (%s, %s, %s);
-    """, (chunk_id, question, emb_question))
+        ) VALUES (%s, %s, %s, %s);
+    """, (chunk_id, document_id, question, emb_question))
 
 # ---------- Load Function ----------
 
@@ -83,6 +85,7 @@ def load_sentences(json_path: str):
 
     chunks = data.get("chunks", [])
     total_chunks = 0
+    chunk_ids = []
 
     # Get file base name for document_id
     document_id = os.path.splitext(os.path.basename(json_path))[0]
@@ -98,6 +101,7 @@ def load_sentences(json_path: str):
 
         with connect() as conn:
             with conn.cursor() as cursor:
+                upsert_document(cursor, document_id, data.get("title"))
                 for chunk in chunks:
                     section   = chunk.get('section')
                     original  = chunk.get('original_sentence')
@@ -121,12 +125,16 @@ def load_sentences(json_path: str):
 
                     question  = chunk.get('question')
                     emb_q     = create_embedding(chunk['question'])
-                    insert_question(cursor, chunk_id, question, emb_q)
+                    insert_question(cursor, document_id, chunk_id, question, emb_q)
+                    chunk_ids.append(chunk_id)
                     total_chunks += 1
 
                     conn.commit()
                     progress.update(task, advance=1)
 
+                update_relationships(cursor, chunk_ids)
+                conn.commit()
+
     print(f"✅ Loaded {total_chunks} chunks from {len(chunks)} sentences.")
 
 # ---------- Entrypoint ----------
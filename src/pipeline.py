@@ -0,0 +1,141 @@
+import sys
+from datetime import datetime
+from bs4 import BeautifulSoup
+from rich.progress import Progress, SpinnerColumn, TextColumn
+
+from src.database import connect, upsert_document
+from src.embedding import create_embeddings
+from src.generate_chunks import chunk_knowledge
+from src.insert_chunks import insert_knowledge_chunk, insert_question
+from src.read_wikipedia import fetch_wikipedia_html, extract_sections, iter_sentence_records
+from src.relationships import update_relationships
+from src.sentence_filter import SentenceFilter
+from src.stages import Stage, run_stages
+
+FETCH_WORKERS = 2
+LLM_WORKERS = 8
+EMBED_BATCH_SIZE = 64
+WRITE_BATCH_SIZE = 64
+
+# ---------- Stages ----------
+
+def fetch(title):
+    timestamp = datetime.now().strftime("%Y-%m-%d")
+    document_id = f"{title.replace(' ', '_')}-{timestamp}"
+    yield document_id, fetch_wikipedia_html(title)
+
+def parse(item):
+    document_id, html = item
+    soup = BeautifulSoup(html, 'html.parser')
+    yield document_id, extract_sections(soup)
+
+def split(item):
+    document_id, sections = item
+    # An article is far below split_many's pool threshold, and pool workers
+    # would re-import this module along with the embedding model and LLM
+    # clients, so always segment in-process.
+    for record in iter_sentence_records(sections, workers=1):
+        yield document_id, record
+
+def sentence_filter(skip: SentenceFilter):
+    """Build the filter stage; it must run on a single worker since `skip` is stateful."""
+    def filter_sentences(item):
+        document_id, record = item
+        if skip.keep(record["sentence"]):
+            yield document_id, record
+    return filter_sentences
+
+def chunk(item):
+    document_id, record = item
+    result = chunk_knowledge(record["sentence"], record["paragraph"])
+    for chunk_object in result.chunks:
+        yield document_id, {**chunk_object.model_dump(), **record}
+
+def embed(batch):
+    """Embed the statement, answer and question of every chunk in one call."""
+    texts = []
+    for _, chunk_data in batch:
+        texts += [chunk_data["statement"], chunk_data["answer"], chunk_data["question"]]
+    embeddings = create_embeddings(texts, batch_size=EMBED_BATCH_SIZE * 3)
+
+    for i, (document_id, chunk_data) in enumerate(batch):
+        emb_decl, emb_ans, emb_q = embeddings[i * 3:i * 3 + 3]
+        yield document_id, chunk_data, emb_decl, emb_ans, emb_q
+
+def writer(conn):
+    """
+    Build the write stage; it owns `conn` and commits once per batch, then
+    links the batch into the chunk graph, so every committed chunk gets its
+    edges even if a later stage fails.
+    """
+    def write(batch):
+        written = {}
+        with conn.cursor() as cursor:
+            for document_id in {document_id for document_id, *_ in batch}:
+                upsert_document(cursor, document_id)
+            for document_id, chunk_data, emb_decl, emb_ans, emb_q in batch:
+                chunk_id = insert_knowledge_chunk(
+                    cursor,
+                    document_id,
+                    chunk_data.get('section'),
+                    chunk_data.get('sentence'),
+                    chunk_data.get('statement'),
+                    chunk_data.get('answer'),
+                    chunk_data.get('citations', []),
+                    emb_decl,
+                    emb_ans
+                )
+                insert_question(cursor, document_id, chunk_id, chunk_data.get('question'), emb_q)
+                written.setdefault(document_id, []).append(chunk_id)
+        conn.commit()
+
+        with conn.cursor() as cursor:
+            update_relationships(cursor, [chunk_id for chunk_ids in written.values() for chunk_id in chunk_ids])
+        conn.commit()
+        yield from written.items()
+    return write
+
+# ---------- Pipeline ----------
+
+def run_pipeline(titles: list[str]):
+    """
+    Fetch, parse, split, chunk, embed and store the given Wikipedia articles
+    as one streaming pipeline. Stages overlap and exchange work through bounded
+    queues, so memory use does not grow with the size of the corpus.
+    """
+    total_chunks = 0
+    skip = SentenceFilter()
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("{task.completed} chunks"),
+        transient=True
+    ) as progress:
+        task = progress.add_task("Running pipeline", total=None)
+
+        with connect() as conn:
+            stages = [
+                Stage("fetch", fetch, workers=FETCH_WORKERS, maxsize=FETCH_WORKERS),
+                Stage("parse", parse, maxsize=FETCH_WORKERS),
+                Stage("split", split, maxsize=FETCH_WORKERS),
+                Stage("filter", sentence_filter(skip), maxsize=LLM_WORKERS * 2),
+                Stage("chunk", chunk, workers=LLM_WORKERS, maxsize=LLM_WORKERS * 2),
+                Stage("embed", embed, batch_size=EMBED_BATCH_SIZE, maxsize=EMBED_BATCH_SIZE * 2),
+                Stage("write", writer(conn), batch_size=WRITE_BATCH_SIZE, maxsize=WRITE_BATCH_SIZE * 2),
+            ]
+            for _, written in run_stages(titles, stages):
+                total_chunks += len(written)
+                progress.update(task, advance=len(written))
+
+    print(f"⏭️ {skip.report()}")
+    print(f"✅ Stored {total_chunks} chunks from {len(titles)} articles.")
+
+# ---------- Entrypoint ----------
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.pipeline <Wikipedia Title> [<Wikipedia Title> ...]")
+        sys.exit(1)
+
+    run_pipeline(sys.argv[1:])
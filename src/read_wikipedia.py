@@ -4,9 +4,13 @@ import re
 import json
 import requests
 from bs4 import BeautifulSoup
-from src.sentence_parser import split_sentences
+from src.sentence_parser import split_many
 from datetime import datetime
 
+# Articles fetched and segmented together; enough paragraphs to make the
+# sentence splitting process pool pay off while bounding memory.
+ARTICLE_BATCH_SIZE = 200
+
 
 def collapse_adjacent_duplicate_citations(text):
     return re.sub(r'(\[\d+\])(?:\1)+', r'\1', text)
@@ -100,19 +104,14 @@ def get_sentence_and_proceeding_citations(text):
 def format_sentence(sentence):
     return re.sub(r'^\s*(?:\[\s*\d+\s*\]\s*)+', '', sentence).strip()
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python read_wikipedia.py <Wikipedia Title>")
-        sys.exit(1)
-
-    title = sys.argv[1]
-    html = fetch_wikipedia_html(title)
-    soup = BeautifulSoup(html, 'html.parser')
-    sections = extract_sections(soup)
-
+def content_paragraphs(sections):
+    """
+    Return (section name, paragraph) pairs for the given sections, skipping
+    sections and paragraphs that carry no article content.
+    """
     sections_to_skip = {"References", "External links", "Further reading", "See also"}
-    data_records = []
     seen_paragraphs = set()
+    paragraphs = []
 
     for section in sections:
         if section["name"] in sections_to_skip:
@@ -122,43 +121,73 @@ def main():
             # Skip exacty duplicate paragraphs
             if paragraph in seen_paragraphs:
                 continue
+            seen_paragraphs.add(paragraph)
             if paragraph.strip() == "v t e":
                 continue
             if not paragraph or paragraph.strip() == "":
                 continue
 
             paragraph = re.sub(r'\s+', ' ', paragraph).strip()
+            paragraphs.append((section["name"], paragraph))
+    return paragraphs
+
+def sentence_records(paragraphs, split_paragraphs):
+    """Yield one record per sentence, given the paragraphs and their sentences."""
+    for (section_name, paragraph), sentences in zip(paragraphs, split_paragraphs):
+        # iterate over each with an index to be able to look up the next sentence
+        for i, sentence_text in enumerate(sentences):
+            # This removes any leading citations from the sentence text.
+            sentence, _ = get_sentence_and_proceeding_citations(sentence_text)
+            next_sentence = None
+
+            if not sentence or sentence.strip() == "" or sentence_text.strip() == "":
+                continue
 
-            sentences = split_sentences(paragraph)
-            # iterate over each with an index to be able to look up the next sentence
-            for i, sentence_text in enumerate(sentences):
-                # This removes any leading citations from the sentence text.
-                sentence, _ = get_sentence_and_proceeding_citations(sentence_text)
-                next_sentence = None
-
-                if not sentence or sentence.strip() == "" or sentence_text.strip() == "":
-                    continue
-
-                next_index = i + 1
-                proceeding_citations = []
-                if next_index < len(sentences):
-                    next_sentence = sentences[next_index]
-                    _, proceeding_citations = get_sentence_and_proceeding_citations(next_sentence)
-
-                embedded_citations = extract_embedded_citations(sentence)
-                citations = embedded_citations + proceeding_citations
-                print(sentence)
-                record = {
-                    "section": section["name"],
-                    "paragraph": paragraph,
-                    "sentence": sentence,
-                    "citations": citations,
-                }
-                data_records.append(record)
+            next_index = i + 1
+            proceeding_citations = []
+            if next_index < len(sentences):
+                next_sentence = sentences[next_index]
+                _, proceeding_citations = get_sentence_and_proceeding_citations(next_sentence)
+
+            embedded_citations = extract_embedded_citations(sentence)
+            citations = embedded_citations + proceeding_citations
+            yield {
+                "section": section_name,
+                "paragraph": paragraph,
+                "sentence": sentence,
+                "citations": citations,
+            }
 
+def iter_sentence_records(sections, workers=None):
+    """
+    Yield one record per sentence in the given sections, skipping sections
+    and paragraphs that carry no article content. `workers` is passed on to
+    split_many.
+    """
+    paragraphs = content_paragraphs(sections)
+    # Segment the whole article in one batch so it can be cached.
+    split_paragraphs = split_many([paragraph for _, paragraph in paragraphs], workers)
+    yield from sentence_records(paragraphs, split_paragraphs)
+
+def sentence_records_many(articles, workers=None):
+    """
+    Return one list of sentence records per article (a list of sections).
+    All articles are segmented in a single split_many batch, so a corpus
+    large enough to benefit is spread over the process pool.
+    """
+    paragraphs = [content_paragraphs(sections) for sections in articles]
+    split_paragraphs = split_many([paragraph for article in paragraphs for _, paragraph in article], workers)
+
+    records, start = [], 0
+    for article in paragraphs:
+        records.append(list(sentence_records(article, split_paragraphs[start:start + len(article)])))
+        start += len(article)
+    return records
+
+def save_records(title, records):
     data = {
         "title": title,
-        "sentences": data_records,
+        "sentences": records,
     }
 
     os.makedirs("raw_data", exist_ok=True)
@@ -167,8 +196,27 @@ def main():
     data["created_at"] = timestamp
     with open(out_filename, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+    return out_filename
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python -m src.read_wikipedia <Wikipedia Title> [<Wikipedia Title> ...]")
+        sys.exit(1)
 
-    print(f"Saved {len(data_records)} sentences to {out_filename}")
+    titles = sys.argv[1:]
+    for batch_start in range(0, len(titles), ARTICLE_BATCH_SIZE):
+        batch = titles[batch_start:batch_start + ARTICLE_BATCH_SIZE]
+        articles = []
+        for title in batch:
+            html = fetch_wikipedia_html(title)
+            soup = BeautifulSoup(html, 'html.parser')
+            articles.append(extract_sections(soup))
+
+        for title, data_records in zip(batch, sentence_records_many(articles)):
+            for record in data_records:
+                print(record["sentence"])
+            out_filename = save_records(title, data_records)
+            print(f"Saved {len(data_records)} sentences to {out_filename}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,278 @@
+import sys
+import numpy as np
+
+from src.database import connect, copy_rows
+
+RELATION_TYPE = "similar"
+EMBEDDING_DIM = 384
+DEFAULT_K = 10
+BLOCK_SIZE = 1024
+
+COLUMNS = ["source_chunk_id", "target_chunk_id", "relation_type", "score"]
+
+# ---------- Similarity ----------
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length so dot products are cosine similarities."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+def top_k(query_ids, queries, corpus_ids, corpus, k: int, block_size: int = BLOCK_SIZE):
+    """
+    Yield (source_id, target_ids, scores) with the `k` most similar corpus rows
+    for every query row, best first. Both sides are processed in blocks of
+    `block_size` rows, so memory is bounded by one block_size x block_size
+    similarity matrix regardless of corpus size. A chunk is never its own neighbour.
+    """
+    def scan():
+        for c_start in range(0, len(corpus), block_size):
+            yield corpus_ids[c_start:c_start + block_size], corpus[c_start:c_start + block_size]
+    yield from stream_top_k(query_ids, queries, scan, k, block_size)
+
+def stream_top_k(query_ids, queries, scan, k: int, block_size: int = BLOCK_SIZE):
+    """
+    Like top_k(), but the corpus is read as (ids, matrix) blocks from `scan()`,
+    which is called once per block of queries. The corpus never has to be in
+    memory at once.
+    """
+    for q_start in range(0, len(queries), block_size):
+        q_ids = query_ids[q_start:q_start + block_size]
+        block = queries[q_start:q_start + block_size]
+        best_scores = np.empty((len(block), 0), dtype=np.float32)
+        best_ids = np.empty((len(block), 0), dtype=np.int64)
+
+        for c_ids, c_block in scan():
+            sims = block @ c_block.T
+            sims[q_ids[:, None] == c_ids[None, :]] = -np.inf
+
+            scores = np.concatenate([best_scores, sims], axis=1)
+            ids = np.concatenate([best_ids, np.broadcast_to(c_ids, sims.shape)], axis=1)
+            if scores.shape[1] > k:
+                keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+                scores = np.take_along_axis(scores, keep, axis=1)
+                ids = np.take_along_axis(ids, keep, axis=1)
+            best_scores, best_ids = scores, ids
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+        for i, source_id in enumerate(q_ids):
+            found = np.isfinite(best_scores[i])
+            yield int(source_id), best_ids[i][found], best_scores[i][found]
+
+def to_edges(neighbors):
+    """Flatten top_k() output into chunk_relationships rows."""
+    for source_id, target_ids, scores in neighbors:
+        for target_id, score in zip(target_ids, scores):
+            yield source_id, int(target_id), RELATION_TYPE, float(score)
+
+def select_additions(candidates, current: dict[int, dict[int, float]], k: int):
+    """
+    Filter the neighbours new chunks offer to existing chunks. Targets a source
+    already links to are dropped, and a source with a full list of `k`
+    neighbours only keeps candidates that beat its weakest one.
+    """
+    for source_id, target_ids, scores in candidates:
+        edges = current.get(source_id, {})
+        keep = ~np.isin(target_ids, list(edges))
+        if len(edges) >= k:
+            keep &= scores > min(edges.values())
+        if keep.any():
+            yield source_id, target_ids[keep], scores[keep]
+
+def plan_update(new_ids, new, scan, load_near, load_current, k: int):
+    """
+    Return (neighbors, additions) for newly inserted chunks: the full neighbour
+    lists of the new chunks, and the edges existing chunks should gain. The
+    corpus is streamed through `scan()` (see stream_top_k); only the existing
+    chunks that appear in a new chunk's neighbour list are revisited, loaded
+    by `load_near(chunk_ids)` as (ids, matrix), and `load_current(source_ids)`
+    returns their current edges.
+    """
+    neighbors = list(stream_top_k(new_ids, new, scan, k))
+    near = np.unique(np.concatenate([targets for _, targets, _ in neighbors] + [np.empty(0, dtype=np.int64)]))
+    near = near[~np.isin(near, new_ids)]
+    if len(near) == 0:
+        return neighbors, []
+
+    near_ids, near_matrix = load_near(near)
+    candidates = list(top_k(near_ids, near_matrix, new_ids, new, k))
+    current = load_current([source_id for source_id, _, _ in candidates])
+    return neighbors, list(select_additions(candidates, current, k))
+
+# ---------- Database ----------
+
+def iter_embeddings(cur, chunk_ids: list[int] | None = None, page_size: int = BLOCK_SIZE):
+    """
+    Yield (ids, matrix) blocks of up to `page_size` declarative embeddings, of
+    all chunks or only those in `chunk_ids`, normalised to unit length and
+    streamed through a server-side cursor.
+    """
+    where, params = embedding_filter(chunk_ids)
+    with cur.connection.cursor(name="relationship_embeddings") as stream:
+        stream.itersize = page_size
+        stream.execute(f"SELECT id, emb_declarative::real[] FROM knowledge_chunks {where} ORDER BY id;", params)
+        while rows := stream.fetchmany(page_size):
+            ids = np.array([row[0] for row in rows], dtype=np.int64)
+            matrix = np.array([row[1] for row in rows], dtype=np.float32)
+            yield ids, normalize(matrix)
+
+def load_embeddings(cur, chunk_ids: list[int] | None = None, page_size: int = BLOCK_SIZE):
+    """
+    Return (ids, matrix) for the declarative embeddings of all chunks, or only
+    those in `chunk_ids`, with every row normalised to unit length. Rows are
+    streamed through a server-side cursor into a preallocated float32 array.
+    """
+    where, params = embedding_filter(chunk_ids)
+    cur.execute(f"SELECT COUNT(*) FROM knowledge_chunks {where};", params)
+    capacity = cur.fetchone()[0]
+    ids = np.empty(capacity, dtype=np.int64)
+    matrix = np.empty((capacity, EMBEDDING_DIM), dtype=np.float32)
+
+    n = 0
+    for block_ids, block in iter_embeddings(cur, chunk_ids, page_size):
+        if n + len(block_ids) > len(ids):
+            # Rows committed after the count; grow instead of dropping them.
+            ids = np.resize(ids, n + len(block_ids))
+            matrix = np.resize(matrix, (n + len(block_ids), EMBEDDING_DIM))
+        ids[n:n + len(block_ids)] = block_ids
+        matrix[n:n + len(block_ids)] = block
+        n += len(block_ids)
+
+    return ids[:n], matrix[:n]
+
+def embedding_filter(chunk_ids: list[int] | None):
+    where = "WHERE emb_declarative IS NOT NULL"
+    if chunk_ids is None:
+        return where, ()
+    return where + " AND id = ANY(%s)", ([int(chunk_id) for chunk_id in chunk_ids],)
+
+def load_edges(cur, source_ids: list[int]) -> dict[int, dict[int, float]]:
+    """Return the current {target: score} neighbours of the given source chunks."""
+    cur.execute("""
+        SELECT source_chunk_id, target_chunk_id, score
+        FROM chunk_relationships
+        WHERE relation_type = %s AND source_chunk_id = ANY(%s);
+    """, (RELATION_TYPE, source_ids))
+    edges = {}
+    for source_id, target_id, score in cur.fetchall():
+        edges.setdefault(source_id, {})[target_id] = score
+    return edges
+
+def document_chunk_ids(cur, document_id: str) -> list[int]:
+    cur.execute("SELECT id FROM knowledge_chunks WHERE document_id = %s ORDER BY id;", (document_id,))
+    return [row[0] for row in cur.fetchall()]
+
+def prune_relationships(cur, source_ids: list[int], k: int):
+    """Keep only the `k` best edges of each of the given source chunks."""
+    cur.execute("""
+        DELETE FROM chunk_relationships
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY source_chunk_id ORDER BY score DESC
+                ) AS rank
+                FROM chunk_relationships
+                WHERE relation_type = %s AND source_chunk_id = ANY(%s)
+            ) ranked
+            WHERE rank > %s
+        );
+    """, (RELATION_TYPE, source_ids, k))
+
+def build_relationships(cur, k: int = DEFAULT_K) -> int:
+    """Recompute the k-nearest-neighbour edges between all chunks."""
+    ids, matrix = load_embeddings(cur)
+    cur.execute("DELETE FROM chunk_relationships WHERE relation_type = %s;", (RELATION_TYPE,))
+    return copy_rows(cur, "chunk_relationships", COLUMNS, to_edges(top_k(ids, matrix, ids, matrix, k)))
+
+def update_relationships(cur, chunk_ids: list[int], k: int = DEFAULT_K) -> int:
+    """
+    Add the edges for newly inserted chunks, e.g. one committed write batch:
+    the new chunks get a full neighbour list, and existing chunks near them
+    only gain edges to new chunks they do not link to yet and that beat the
+    weakest neighbour they already have. The table is streamed
+    in blocks, so memory depends on the number of new chunks, not the table
+    size. Run `build` for an exact graph over the whole table.
+    """
+    new_ids, new = load_embeddings(cur, chunk_ids)
+    if len(new_ids) == 0:
+        return 0
+
+    neighbors, additions = plan_update(
+        new_ids, new,
+        lambda: iter_embeddings(cur),
+        lambda near_ids: load_embeddings(cur, near_ids),
+        lambda source_ids: load_edges(cur, source_ids),
+        k,
+    )
+
+    cur.execute("""
+        DELETE FROM chunk_relationships
+        WHERE relation_type = %s AND source_chunk_id = ANY(%s);
+    """, (RELATION_TYPE, new_ids.tolist()))
+    total = copy_rows(cur, "chunk_relationships", COLUMNS, to_edges(neighbors))
+
+    if additions:
+        total += copy_rows(cur, "chunk_relationships", COLUMNS, to_edges(additions))
+        prune_relationships(cur, [source_id for source_id, _, _ in additions], k)
+    return total
+
+def related(chunk_id: int, k: int = DEFAULT_K):
+    """
+    Return the `k` chunks most similar to `chunk_id` from the precomputed graph
+    as (chunk_id, declarative_sentence, answer, score) tuples, best first.
+    """
+    with connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT kc.id, kc.declarative_sentence, kc.answer, r.score
+                FROM chunk_relationships r
+                JOIN knowledge_chunks kc ON kc.id = r.target_chunk_id
+                WHERE r.source_chunk_id = %s AND r.relation_type = %s
+                ORDER BY r.score DESC
+                LIMIT %s;
+            """, (chunk_id, RELATION_TYPE, k))
+            return cur.fetchall()
+
+# ---------- Entrypoint ----------
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    usage = "Usage: python -m src.relationships <build [k]|update <document_id> [k]|related <chunk_id> [k]>"
+
+    if len(sys.argv) < 2:
+        console.print(usage)
+        sys.exit(1)
+
+    command = sys.argv[1].lower()
+    if command == "build":
+        k = int(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_K
+        with connect() as conn:
+            with conn.cursor() as cur:
+                total = build_relationships(cur, k)
+            conn.commit()
+        console.print(f"✅ Wrote {total} chunk relationships.")
+    elif command == "update" and len(sys.argv) > 2:
+        k = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_K
+        with connect() as conn:
+            with conn.cursor() as cur:
+                total = update_relationships(cur, document_chunk_ids(cur, sys.argv[2]), k)
+            conn.commit()
+        console.print(f"✅ Wrote {total} chunk relationships for '{sys.argv[2]}'.")
+    elif command == "related" and len(sys.argv) > 2:
+        k = int(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_K
+        table = Table(title=f"Chunks related to {sys.argv[2]}")
+        table.add_column("Chunk", justify="right")
+        table.add_column("Statement", style="magenta")
+        table.add_column("Answer", style="green")
+        table.add_column("Score", justify="right")
+        for chunk_id, statement, answer, score in related(int(sys.argv[2]), k):
+            table.add_row(str(chunk_id), statement, answer, f"{score:.4f}")
+        console.print(table)
+    else:
+        console.print(usage)
+        sys.exit(1)
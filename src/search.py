@@ -11,10 +11,31 @@ def to_pgvector_literal(vec: list[float]) -> str:
     return '[' + ','.join(f'{v:.6f}' for v in vec) + ']'
 
 
-def search(query: str, k: int = 5):
+def scope_filter(
+    alias: str,
+    document_id: str | None = None,
+    section: str | None = None,
+    chunk_alias: str = "kc",
+) -> str:
+    """
+    Build the WHERE clause restricting rows of `alias` to a document and/or
+    section, using named parameters so the planner can use the document index
+    before computing any vector distances. Only knowledge_chunks has a section
+    column, so that condition uses `chunk_alias`, which the query must join.
+    """
+    conditions = []
+    if document_id is not None:
+        conditions.append(f"{alias}.document_id = %(document_id)s")
+    if section is not None:
+        conditions.append(f"{chunk_alias}.section = %(section)s")
+    return "WHERE " + " AND ".join(conditions) if conditions else ""
+
+
+def search(query: str, k: int = 5, document_id: str | None = None, section: str | None = None):
     """
     Search all fields (questions, answers, declarative sentences) for semantic similarity
-    and return top-k results ordered by closest distance.
+    and return top-k results ordered by closest distance, optionally restricted to
+    one document and/or section.
 
     Returns a list of tuples:
     (question, answer, declarative_sentence, original_sentence, distance, source)
@@ -22,18 +43,21 @@ def search(query: str, k: int = 5):
 
     raw_emb = create_embedding(query)
     pg_emb = to_pgvector_literal(raw_emb)
+    question_filter = scope_filter("q", document_id, section)
+    chunk_filter = scope_filter("kc", document_id, section)
 
-    sql = """
+    sql = f"""
     WITH question_matches AS (
         SELECT
             q.question,
             kc.answer,
             kc.declarative_sentence,
             kc.original_sentence,
-            q.emb_question <-> %s::vector AS distance,
+            q.emb_question <-> %(embedding)s::vector AS distance,
             'question' AS source
         FROM questions q
         JOIN knowledge_chunks kc ON q.chunk_id = kc.id
+        {question_filter}
     ),
     answer_matches AS (
         SELECT
@@ -41,9 +65,10 @@ def search(query: str, k: int = 5):
             kc.answer,
             kc.declarative_sentence,
             kc.original_sentence,
-            kc.emb_answer <-> %s::vector AS distance,
+            kc.emb_answer <-> %(embedding)s::vector AS distance,
             'answer' AS source
         FROM knowledge_chunks kc
+        {chunk_filter}
     ),
     declarative_matches AS (
         SELECT
@@ -51,9 +76,10 @@ def search(query: str, k: int = 5):
             kc.answer,
             kc.declarative_sentence,
             kc.original_sentence,
-            kc.emb_declarative <-> %s::vector AS distance,
+            kc.emb_declarative <-> %(embedding)s::vector AS distance,
             'declarative' AS source
         FROM knowledge_chunks kc
+        {chunk_filter}
     )
     SELECT * FROM (
         SELECT * FROM question_matches
@@ -63,12 +89,143 @@ def search(query: str, k: int = 5):
         SELECT * FROM declarative_matches
     ) combined
     ORDER BY distance
-    LIMIT %s;
+    LIMIT %(k)s;
     """
+    params = {"embedding": pg_emb, "k": k, "document_id": document_id, "section": section}
 
     with connect() as conn:
         with conn.cursor() as cur:
-            cur.execute(sql, (pg_emb, pg_emb, pg_emb, k))
+            cur.execute(sql, params)
+            results = cur.fetchall()
+
+    return results
+
+
+DEFAULT_WEIGHTS = {"question": 1.0, "answer": 1.0, "declarative": 1.0}
+
+
+def search_chunks(
+    query: str,
+    k: int = 5,
+    document_id: str | None = None,
+    section: str | None = None,
+    fusion: str = "min",
+    weights: dict[str, float] | None = None,
+    candidates: int | None = None,
+):
+    """
+    Search questions, answers and declarative sentences like search(), but group
+    the matches by chunk in SQL and return `k` distinct chunks. Each field
+    contributes its `candidates` nearest chunks (2k by default); the per-field
+    distances of every candidate are then fused, either by taking the minimum
+    ("min") or a weighted mean ("weighted", using `weights`).
+
+    Returns a list of tuples:
+    (chunk_id, question, answer, declarative_sentence, original_sentence, distance, source)
+    where source is the field that matched the query most closely.
+    """
+    if fusion == "min":
+        fused = "LEAST(question_distance, answer_distance, declarative_distance)"
+    elif fusion == "weighted":
+        fused = """(
+            %(w_question)s * COALESCE(question_distance, 0)
+            + %(w_answer)s * answer_distance
+            + %(w_declarative)s * declarative_distance
+        ) / (
+            CASE WHEN question_distance IS NULL THEN 0 ELSE %(w_question)s END
+            + %(w_answer)s + %(w_declarative)s
+        )"""
+    else:
+        raise ValueError(f"Unknown fusion '{fusion}', expected 'min' or 'weighted'.")
+
+    weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+    if any(weight < 0 for weight in weights.values()):
+        raise ValueError("Fusion weights must not be negative.")
+    # Chunks without a question are fused from answer and declarative alone.
+    if fusion == "weighted" and weights["answer"] + weights["declarative"] <= 0:
+        raise ValueError("The answer and declarative weights must not both be zero.")
+    raw_emb = create_embedding(query)
+    pg_emb = to_pgvector_literal(raw_emb)
+    question_filter = scope_filter("q", document_id, section)
+    chunk_filter = scope_filter("kc", document_id, section)
+
+    sql = f"""
+    WITH candidates AS (
+        (
+            SELECT q.chunk_id AS id
+            FROM questions q
+            JOIN knowledge_chunks kc ON q.chunk_id = kc.id
+            {question_filter}
+            ORDER BY q.emb_question <-> %(embedding)s::vector
+            LIMIT %(candidates)s
+        )
+        UNION
+        (
+            SELECT kc.id
+            FROM knowledge_chunks kc
+            {chunk_filter}
+            ORDER BY kc.emb_answer <-> %(embedding)s::vector
+            LIMIT %(candidates)s
+        )
+        UNION
+        (
+            SELECT kc.id
+            FROM knowledge_chunks kc
+            {chunk_filter}
+            ORDER BY kc.emb_declarative <-> %(embedding)s::vector
+            LIMIT %(candidates)s
+        )
+    ),
+    scored AS (
+        SELECT
+            kc.id,
+            best_question.question,
+            kc.answer,
+            kc.declarative_sentence,
+            kc.original_sentence,
+            best_question.distance AS question_distance,
+            kc.emb_answer <-> %(embedding)s::vector AS answer_distance,
+            kc.emb_declarative <-> %(embedding)s::vector AS declarative_distance
+        FROM candidates c
+        JOIN knowledge_chunks kc ON kc.id = c.id
+        LEFT JOIN LATERAL (
+            SELECT q.question, q.emb_question <-> %(embedding)s::vector AS distance
+            FROM questions q
+            WHERE q.chunk_id = kc.id
+            ORDER BY distance
+            LIMIT 1
+        ) best_question ON true
+    )
+    SELECT
+        id,
+        question,
+        answer,
+        declarative_sentence,
+        original_sentence,
+        {fused} AS distance,
+        CASE LEAST(question_distance, answer_distance, declarative_distance)
+            WHEN question_distance THEN 'question'
+            WHEN answer_distance THEN 'answer'
+            ELSE 'declarative'
+        END AS source
+    FROM scored
+    ORDER BY distance
+    LIMIT %(k)s;
+    """
+    params = {
+        "embedding": pg_emb,
+        "k": k,
+        "candidates": candidates or k * 2,
+        "document_id": document_id,
+        "section": section,
+        "w_question": weights["question"],
+        "w_answer": weights["answer"],
+        "w_declarative": weights["declarative"],
+    }
+
+    with connect() as conn:
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
             results = cur.fetchall()
 
     return results
@@ -81,24 +238,40 @@ if __name__ == "__main__":
 
     console = Console()
 
-    if len(sys.argv) < 2:
-        console.print("Usage: python -m src.search <query> [k]")
+    flags = [arg for arg in sys.argv[1:] if arg.startswith("--")]
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    usage = "Usage: python -m src.search <query> [k] [document_id] [section] [--chunks] [--fusion=min|weighted]"
+    fusion = next((flag.split("=", 1)[1] for flag in flags if flag.startswith("--fusion=")), None)
+    by_chunk = "--chunks" in flags or fusion is not None
+
+    if not args or any(flag != "--chunks" and not flag.startswith("--fusion=") for flag in flags):
+        console.print(usage)
         sys.exit(1)
 
-    query = sys.argv[1]
-    k = int(sys.argv[2]) if len(sys.argv) > 2 else 5
-    rows = search(query, k)
+    query = args[0]
+    k = int(args[1]) if len(args) > 1 else 5
+    document_id = args[2] if len(args) > 2 else None
+    section = args[3] if len(args) > 3 else None
 
     table = Table(title="Search Results")
     table.add_column("#", justify="right")
+    if by_chunk:
+        table.add_column("Chunk", justify="right")
     table.add_column("Question", style="cyan")
     table.add_column("Answer", style="green")
     table.add_column("Statement", style="magenta")
     table.add_column("Distance", justify="right")
     table.add_column("Source", style="yellow")
 
-    for i, (question, answer, declarative, original, dist, source) in enumerate(rows, 1):
-        display_question = question if question else "-"
-        table.add_row(str(i), display_question, answer, declarative, f"{dist:.4f}", source)
+    if by_chunk:
+        rows = search_chunks(query, k, document_id, section, fusion=fusion or "min")
+        for i, (chunk_id, question, answer, declarative, original, dist, source) in enumerate(rows, 1):
+            display_question = question if question else "-"
+            table.add_row(str(i), str(chunk_id), display_question, answer, declarative, f"{dist:.4f}", source)
+    else:
+        rows = search(query, k, document_id, section)
+        for i, (question, answer, declarative, original, dist, source) in enumerate(rows, 1):
+            display_question = question if question else "-"
+            table.add_row(str(i), display_question, answer, declarative, f"{dist:.4f}", source)
 
     console.print(table)
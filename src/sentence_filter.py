@@ -0,0 +1,156 @@
+import re
+import hashlib
+from collections import Counter
+import numpy as np
+
+# Navigation and maintenance text Wikipedia renders inline with article content.
+# Bracketed notes such as "[ citation needed ]" normalize to nothing ("empty").
+BOILERPLATE = {
+    "v t e",
+    "index outline glossary",
+}
+# Hatnotes ("Main article: ...") and maintenance notices. Prose can open with
+# the same words, so a prefix only counts when followed by a colon, inside a
+# bracket, or in a sentence of at most BOILERPLATE_MAX_WORDS words.
+BOILERPLATE_PREFIXES = ("main article", "see also", "further information", "this section")
+BOILERPLATE_MAX_WORDS = 6
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "in",
+    "is", "it", "its", "of", "on", "or", "that", "the", "this", "to", "was",
+    "were", "which", "with",
+}
+
+MIN_CONTENT_WORDS = 3
+MIN_ALPHA_RATIO = 0.5
+NEAR_DUPLICATE_THRESHOLD = 0.8
+SHINGLE_SIZE = 3
+NUM_PERMUTATIONS = 64
+BANDS = 16
+
+# Rough token estimate for the chunking prompt: ~4 characters per token plus
+# the fixed signature instructions and structured output of each LLM call.
+CHARS_PER_TOKEN = 4
+PROMPT_OVERHEAD_TOKENS = 250
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.default_rng(7)
+_A = _rng.integers(1, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, _PRIME, NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop citation markers and collapse everything but words."""
+    text = re.sub(r'\[[^\]]*\]', ' ', text.lower())
+    return re.sub(r'[^\w]+', ' ', text).strip()
+
+def estimate_tokens(sentence: str) -> int:
+    return PROMPT_OVERHEAD_TOKENS + len(sentence) // CHARS_PER_TOKEN
+
+def is_boilerplate(sentence: str, normalized: str) -> bool:
+    if normalized in BOILERPLATE:
+        return True
+    if normalized.startswith(BOILERPLATE_PREFIXES) and (
+        len(normalized.split()) <= BOILERPLATE_MAX_WORDS
+        or re.match(r'\s*[\[(]', sentence)
+        or re.match(r'\s*(?:%s)s?\s*:' % "|".join(BOILERPLATE_PREFIXES), sentence, re.IGNORECASE)
+    ):
+        return True
+    # Navigation lists such as "Index Outline Glossary": capitalised words
+    # with no sentence punctuation at all.
+    words = sentence.split()
+    return (
+        len(words) > 1
+        and not re.search(r'[.!?:;,]', sentence)
+        and all(word[:1].isupper() for word in words)
+    )
+
+def is_fragment(sentence: str, normalized: str) -> bool:
+    content_words = {w for w in normalized.split() if w not in STOPWORDS and len(w) > 2}
+    if len(content_words) < MIN_CONTENT_WORDS:
+        return True
+    letters = sum(c.isalpha() for c in sentence)
+    return letters / max(len(sentence), 1) < MIN_ALPHA_RATIO
+
+def minhash(normalized: str) -> np.ndarray:
+    """MinHash signature of the word shingles of a normalized sentence."""
+    words = normalized.split()
+    shingles = {
+        " ".join(words[i:i + SHINGLE_SIZE])
+        for i in range(max(len(words) - SHINGLE_SIZE + 1, 1))
+    }
+    hashes = np.array([
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=4).digest(), "little")
+        for s in shingles
+    ], dtype=np.uint64)
+    return ((np.outer(_A, hashes) + _B[:, None]) % _PRIME).min(axis=1)
+
+
+class SentenceFilter:
+    """
+    Drops sentences that are not worth an LLM call: empty strings, navigation
+    boilerplate, low-information fragments, exact duplicates and near
+    duplicates (MinHash with LSH banding). Keeps per-reason counts and an
+    estimate of the prompt tokens saved.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.seen = set()
+        self.signatures = []
+        self.buckets = {}
+        self.skipped = Counter()
+        self.kept = 0
+        self.saved_tokens = 0
+
+    def reason(self, sentence: str) -> str | None:
+        """Return why `sentence` should be skipped, or None to keep it."""
+        normalized = normalize(sentence)
+        if not normalized:
+            return "empty"
+        if is_boilerplate(sentence, normalized):
+            return "boilerplate"
+        if is_fragment(sentence, normalized):
+            return "fragment"
+
+        digest = hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+        if digest in self.seen:
+            return "duplicate"
+        self.seen.add(digest)
+
+        signature = minhash(normalized)
+        rows = NUM_PERMUTATIONS // BANDS
+        keys = [(band, signature[band * rows:(band + 1) * rows].tobytes()) for band in range(BANDS)]
+        candidates = {i for key in keys for i in self.buckets.get(key, ())}
+        for i in candidates:
+            if np.mean(self.signatures[i] == signature) >= self.threshold:
+                return "near_duplicate"
+
+        index = len(self.signatures)
+        self.signatures.append(signature)
+        for key in keys:
+            self.buckets.setdefault(key, []).append(index)
+        return None
+
+    def keep(self, sentence: str) -> bool:
+        reason = self.reason(sentence)
+        if reason is None:
+            self.kept += 1
+            return True
+        self.skipped[reason] += 1
+        self.saved_tokens += estimate_tokens(sentence)
+        return False
+
+    def filter(self, records):
+        """Yield the records whose "sentence" should be sent to the LLM."""
+        for record in records:
+            if self.keep(record.get("sentence", "")):
+                yield record
+
+    def report(self) -> str:
+        total = sum(self.skipped.values())
+        reasons = ", ".join(f"{count} {reason}" for reason, count in self.skipped.most_common())
+        summary = f"Skipped {total} of {total + self.kept} sentences"
+        if reasons:
+            summary += f" ({reasons})"
+        return f"{summary}, saving ~{self.saved_tokens} LLM tokens."
@@ -0,0 +1,130 @@
+import queue
+import threading
+
+DEFAULT_QUEUE_SIZE = 64
+
+# Marks the end of a stream; passed along from each stage to the next.
+DONE = object()
+
+
+class Stage:
+    """
+    A single step of a streaming pipeline.
+
+    `fn` receives one item (or a list of up to `batch_size` items when batching
+    is enabled) and returns an iterable of items for the next stage. `workers`
+    threads run `fn` concurrently, reading from a queue bounded by `maxsize` so
+    a slow stage applies backpressure to the stages in front of it.
+    """
+
+    def __init__(self, name, fn, workers=1, batch_size=None, maxsize=DEFAULT_QUEUE_SIZE):
+        self.name = name
+        self.fn = fn
+        self.workers = workers
+        self.batch_size = batch_size
+        self.maxsize = maxsize
+
+
+def _put(q, item, stop):
+    """Block until `item` is queued, giving up if the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _get(q, stop):
+    """Block until an item is available, returning DONE if the pipeline is stopping."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return DONE
+
+def _feed(source, outbox, stop, errors):
+    try:
+        for item in source:
+            if not _put(outbox, item, stop):
+                return
+        _put(outbox, DONE, stop)
+    except Exception as e:
+        errors.append(e)
+        stop.set()
+
+def _work(stage, inbox, outbox, stop, errors, remaining, lock):
+    try:
+        finished = False
+        while not finished:
+            item = _get(inbox, stop)
+            if item is DONE:
+                break
+
+            batch = [item]
+            while stage.batch_size and len(batch) < stage.batch_size:
+                try:
+                    item = inbox.get_nowait()
+                except queue.Empty:
+                    break
+                if item is DONE:
+                    finished = True
+                    break
+                batch.append(item)
+
+            for out in stage.fn(batch if stage.batch_size else batch[0]) or ():
+                if not _put(outbox, out, stop):
+                    return
+
+        # Hand the end marker back so sibling workers also see it, and let
+        # the last worker of the stage pass it on downstream.
+        _put(inbox, DONE, stop)
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                _put(outbox, DONE, stop)
+    except Exception as e:
+        errors.append(e)
+        stop.set()
+
+
+def run_stages(source, stages, maxsize=DEFAULT_QUEUE_SIZE):
+    """
+    Stream `source` through `stages` concurrently and yield what the last stage
+    produces. Every stage runs in its own threads, so network, CPU and database
+    work overlap while the bounded queues keep memory flat. The first exception
+    raised by any stage stops the pipeline and is re-raised here.
+    """
+    stop = threading.Event()
+    errors = []
+    queues = [queue.Queue(stage.maxsize) for stage in stages] + [queue.Queue(maxsize)]
+
+    threads = [threading.Thread(target=_feed, args=(source, queues[0], stop, errors), daemon=True)]
+    for i, stage in enumerate(stages):
+        remaining = [stage.workers]
+        lock = threading.Lock()
+        for n in range(stage.workers):
+            threads.append(threading.Thread(
+                target=_work,
+                args=(stage, queues[i], queues[i + 1], stop, errors, remaining, lock),
+                name=f"{stage.name}-{n}",
+                daemon=True,
+            ))
+
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            item = _get(queues[-1], stop)
+            if item is DONE:
+                break
+            yield item
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
@@ -0,0 +1,21 @@
+import pytest
+
+from src.evaluate import summarize, pick_fastest
+
+def test_summarize_reports_recall_and_latency_in_ms():
+    summary = summarize([True, False, True, True], [0.001, 0.002, 0.003, 0.004])
+    assert summary["recall"] == 0.75
+    assert summary["p50"] == pytest.approx(2.5)
+    assert summary["p99"] == pytest.approx(3.97)
+
+def test_summarize_empty():
+    assert summarize([], []) == {"recall": 0.0, "p50": 0.0, "p99": 0.0}
+
+def test_pick_fastest_respects_recall_target():
+    results = [
+        {"recall": 0.99, "p50": 9.0, "p99": 20.0},
+        {"recall": 0.92, "p50": 2.0, "p99": 4.0},
+        {"recall": 0.70, "p50": 0.5, "p99": 1.0},
+    ]
+    assert pick_fastest(results, 0.9) is results[1]
+    assert pick_fastest(results, 0.995) is None
@@ -0,0 +1,87 @@
+import datetime
+
+import numpy as np
+import pyarrow as pa
+
+from src.export import (
+    EMBEDDING_DIM,
+    SCHEMAS,
+    batch_to_rows,
+    embedding_matrix,
+    export_table,
+    read_table,
+    rows_to_batch,
+)
+
+def vector_text(seed):
+    return "[" + ",".join(str(float(seed + i)) for i in range(EMBEDDING_DIM)) + "]"
+
+QUESTION_ROWS = [
+    (1, 10, "Doc-2025-06-25", "What is a chunk?", vector_text(0)),
+    (2, 11, "Doc-2025-06-25", "What is recall?", vector_text(1)),
+    (3, 12, "Doc-2025-06-25", "No embedding yet?", None),
+]
+
+class FakeNamedCursor:
+    def __init__(self, rows):
+        self.rows = list(rows)
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc):
+        return False
+    def execute(self, sql):
+        pass
+    def fetchmany(self, size):
+        rows, self.rows = self.rows[:size], self.rows[size:]
+        return rows
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.rows = rows
+    def cursor(self, name=None):
+        return FakeNamedCursor(self.rows)
+
+def test_rows_to_batch_uses_fixed_size_float32_vectors():
+    batch = rows_to_batch(QUESTION_ROWS, SCHEMAS["questions"])
+    column = batch.column("emb_question")
+    assert column.type == pa.list_(pa.float32(), EMBEDDING_DIM)
+    assert column.null_count == 1
+    assert column[1].as_py()[:2] == [1.0, 2.0]
+
+def test_batch_to_rows_round_trips_pgvector_literals():
+    batch = rows_to_batch(QUESTION_ROWS, SCHEMAS["questions"])
+    rows = list(batch_to_rows(batch))
+    assert rows[0][:4] == (1, 10, "Doc-2025-06-25", "What is a chunk?")
+    assert rows[0][4] == vector_text(0)
+    assert rows[2][4] is None
+
+def test_batch_to_rows_formats_timestamps():
+    created_at = datetime.datetime(2025, 6, 25, tzinfo=datetime.timezone.utc)
+    batch = rows_to_batch([("Doc", "Doc", created_at)], SCHEMAS["documents"])
+    assert list(batch_to_rows(batch)) == [("Doc", "Doc", "2025-06-25T00:00:00+00:00")]
+
+def test_export_and_memory_mapped_read(tmp_path):
+    rows = QUESTION_ROWS[:2]
+    for extension in ("parquet", "arrow"):
+        path = str(tmp_path / f"questions.{extension}")
+        assert export_table(FakeConnection(rows), "questions", path, row_group_size=1) == 2
+
+        table = read_table(path)
+        assert table.column("question").to_pylist() == ["What is a chunk?", "What is recall?"]
+        matrix, valid = embedding_matrix(table, "emb_question")
+        assert matrix.shape == (2, EMBEDDING_DIM)
+        assert valid.tolist() == [True, True]
+        assert matrix.dtype == np.float32
+        assert matrix[1, 0] == 1.0
+
+def test_embedding_matrix_keeps_rows_aligned_with_null_embeddings(tmp_path):
+    rows = [QUESTION_ROWS[0], QUESTION_ROWS[2], QUESTION_ROWS[1]]
+    for extension in ("parquet", "arrow"):
+        path = str(tmp_path / f"questions.{extension}")
+        export_table(FakeConnection(rows), "questions", path)
+
+        matrix, valid = embedding_matrix(read_table(path), "emb_question")
+        assert matrix.shape == (3, EMBEDDING_DIM)
+        assert valid.tolist() == [True, False, True]
+        assert matrix[0, 1] == 1.0
+        assert matrix[2, 1] == 2.0
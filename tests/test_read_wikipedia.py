@@ -8,6 +8,8 @@ from src.read_wikipedia import (
     get_sentence_and_proceeding_citations,
     format_sentence,
     extract_sections,
+    iter_sentence_records,
+    sentence_records_many,
 )
 
 def test_collapse_adjacent_duplicate_citations():
@@ -57,3 +59,24 @@ def test_extract_sections_minimal_html():
     assert "This is the first paragraph." in sections[0]["paragraphs"]
     assert "Bullet one Bullet two" in sections[0]["paragraphs"]
 
+
+def test_iter_sentence_records_skips_boilerplate_sections():
+    sections = [
+        {"name": "Introduction", "paragraphs": ["v t e", "First sentence. [ 1 ] Second sentence."]},
+        {"name": "References", "paragraphs": ["Should be skipped."]},
+    ]
+    records = list(iter_sentence_records(sections))
+    assert [r["sentence"] for r in records] == ["First sentence.", "Second sentence."]
+    assert records[0]["citations"] == [1]
+    assert all(r["section"] == "Introduction" for r in records)
+
+def test_sentence_records_many_matches_per_article_records():
+    articles = [
+        [{"name": "Introduction", "paragraphs": ["First sentence. [ 1 ] Second sentence."]}],
+        [],
+        [
+            {"name": "Overview", "paragraphs": ["Another article. It has two sentences."]},
+            {"name": "See also", "paragraphs": ["Should be skipped."]},
+        ],
+    ]
+    assert sentence_records_many(articles) == [list(iter_sentence_records(sections)) for sections in articles]
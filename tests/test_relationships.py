@@ -0,0 +1,103 @@
+import numpy as np
+
+from src.database import parse_vector
+from src.relationships import normalize, plan_update, select_additions, stream_top_k, top_k, to_edges
+
+def brute_force(ids, matrix, k):
+    sims = matrix @ matrix.T
+    np.fill_diagonal(sims, -np.inf)
+    order = np.argsort(-sims, axis=1)[:, :k]
+    return {int(ids[i]): [int(ids[j]) for j in row] for i, row in enumerate(order)}
+
+def test_top_k_matches_brute_force_across_blocks():
+    rng = np.random.default_rng(0)
+    ids = np.arange(100, 137, dtype=np.int64)
+    matrix = normalize(rng.normal(size=(len(ids), 8)).astype(np.float32))
+
+    neighbors = {source: list(targets) for source, targets, _ in top_k(ids, matrix, ids, matrix, k=5, block_size=7)}
+    assert neighbors == brute_force(ids, matrix, 5)
+
+def test_stream_top_k_matches_brute_force_over_corpus_blocks():
+    rng = np.random.default_rng(2)
+    ids = np.arange(1, 30, dtype=np.int64)
+    matrix = normalize(rng.normal(size=(len(ids), 8)).astype(np.float32))
+    scan = lambda: ((ids[i:i + 4], matrix[i:i + 4]) for i in range(0, len(ids), 4))
+
+    neighbors = {source: list(targets) for source, targets, _ in stream_top_k(ids, matrix, scan, k=3, block_size=10)}
+    assert neighbors == brute_force(ids, matrix, 3)
+
+def test_top_k_excludes_self_and_orders_scores():
+    ids = np.array([1, 2, 3], dtype=np.int64)
+    matrix = normalize(np.array([[1, 0], [1, 0.1], [0, 1]], dtype=np.float32))
+
+    results = list(top_k(ids, matrix, ids, matrix, k=5))
+    source, targets, scores = results[0]
+    assert source == 1
+    assert list(targets) == [2, 3]
+    assert scores[0] > scores[1]
+
+def test_to_edges_flattens_neighbors():
+    edges = list(to_edges([(1, np.array([2, 3]), np.array([0.9, 0.5], dtype=np.float32))]))
+    assert [(s, t, r) for s, t, r, _ in edges] == [(1, 2, "similar"), (1, 3, "similar")]
+    assert edges[0][3] == np.float32(0.9)
+
+def test_parse_vector():
+    assert parse_vector("[0.1,-2,3.5]") == [0.1, -2.0, 3.5]
+    assert parse_vector("[]") == []
+
+def apply_update(graph, all_ids, matrix, new_ids, k):
+    """Mirror update_relationships() against an in-memory {source: {target: score}} graph."""
+    new = matrix[np.isin(all_ids, new_ids)]
+    loaded = []
+
+    def load_near(near_ids):
+        loaded.extend(near_ids.tolist())
+        mask = np.isin(all_ids, near_ids)
+        return all_ids[mask], matrix[mask]
+
+    neighbors, additions = plan_update(
+        new_ids, new,
+        lambda: ((all_ids[i:i + 7], matrix[i:i + 7]) for i in range(0, len(all_ids), 7)),
+        load_near,
+        lambda source_ids: {s: dict(graph[s]) for s in source_ids if s in graph}, k
+    )
+    # Only existing chunks next to the new ones are loaded, never the table.
+    assert not set(loaded) & set(new_ids.tolist())
+    assert len(loaded) <= len(new_ids) * k
+    for source_id, targets, scores in neighbors:
+        graph[source_id] = dict(zip(targets.tolist(), scores.tolist()))
+    for source_id, targets, scores in additions:
+        edges = graph.setdefault(source_id, {})
+        assert not set(targets.tolist()) & set(edges), "an existing edge was written twice"
+        edges.update(zip(targets.tolist(), scores.tolist()))
+        graph[source_id] = dict(sorted(edges.items(), key=lambda e: -e[1])[:k])
+
+def test_update_two_documents_never_duplicates_edges():
+    rng = np.random.default_rng(1)
+    ids = np.arange(1, 61, dtype=np.int64)
+    matrix = normalize(rng.normal(size=(len(ids), 8)).astype(np.float32))
+    old, doc_a, doc_b = ids[:20], ids[20:40], ids[40:]
+    k = 5
+
+    old_mask = np.isin(ids, old)
+    graph = {s: dict(zip(t.tolist(), sc.tolist()))
+             for s, t, sc in top_k(old, matrix[old_mask], old, matrix[old_mask], k)}
+
+    # Both documents are already in the table when A is updated, then B,
+    # as when the pipeline wrote them in one run and updated per document.
+    apply_update(graph, ids, matrix, doc_a, k)
+    apply_update(graph, ids, matrix, doc_b, k)
+
+    expected = brute_force(ids, matrix, k)
+    for source_id, edges in graph.items():
+        assert len(edges) <= k
+        assert source_id not in edges
+        if source_id in doc_a or source_id in doc_b:
+            assert sorted(edges) == sorted(expected[source_id])
+
+def test_select_additions_skips_existing_targets_and_weak_candidates():
+    candidates = [(1, np.array([2, 3, 4]), np.array([0.9, 0.8, 0.1], dtype=np.float32))]
+    current = {1: {2: 0.9, 5: 0.5}}
+    [(source, targets, scores)] = select_additions(candidates, current, k=2)
+    assert source == 1
+    assert list(targets) == [3]
@@ -0,0 +1,25 @@
+import pytest
+
+# src.search loads the embedding model through src.embedding.
+pytest.importorskip("sentence_transformers")
+
+from src.search import scope_filter, search_chunks
+
+def test_scope_filter_without_scope_is_empty():
+    assert scope_filter("q") == ""
+
+def test_scope_filter_uses_alias_for_document_and_chunk_alias_for_section():
+    assert scope_filter("q", document_id="History-2025-06-25") == "WHERE q.document_id = %(document_id)s"
+    assert scope_filter("q", "History-2025-06-25", "Etymology") == (
+        "WHERE q.document_id = %(document_id)s AND kc.section = %(section)s"
+    )
+    assert scope_filter("q", section="Etymology", chunk_alias="chunk") == "WHERE chunk.section = %(section)s"
+
+@pytest.mark.parametrize("fusion, weights", [
+    ("max", None),
+    ("weighted", {"question": -1.0}),
+    ("weighted", {"answer": 0.0, "declarative": 0.0}),
+])
+def test_search_chunks_rejects_invalid_fusion_settings(fusion, weights):
+    with pytest.raises(ValueError):
+        search_chunks("what is history?", fusion=fusion, weights=weights)
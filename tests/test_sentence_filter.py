@@ -0,0 +1,44 @@
+from src.sentence_filter import SentenceFilter, estimate_tokens, normalize
+
+def test_normalize_drops_citations_and_punctuation():
+    assert normalize("History is the study of the past . [ 1 ] [ 2 ]") == "history is the study of the past"
+
+def test_filter_skips_boilerplate_and_fragments():
+    sentence_filter = SentenceFilter()
+    assert sentence_filter.reason("Index Outline Glossary") == "boilerplate"
+    assert sentence_filter.reason("v t e") == "boilerplate"
+    assert sentence_filter.reason("[ citation needed ]") == "empty"
+    assert sentence_filter.reason("(2001).") == "fragment"
+    assert sentence_filter.reason("ISBN 978-0-521-78749-9 .") == "fragment"
+    assert sentence_filter.reason("History is the systematic study of the past.") is None
+
+def test_filter_keeps_content_sentences_with_boilerplate_prefixes():
+    sentence_filter = SentenceFilter()
+    assert sentence_filter.reason("Main article: History of the United States") == "boilerplate"
+    assert sentence_filter.reason("See also: Systems theory") == "boilerplate"
+    assert sentence_filter.reason("This section needs expansion.") == "boilerplate"
+    assert sentence_filter.reason("(This section needs additional citations for verification.)") == "boilerplate"
+    assert sentence_filter.reason("This section of the treaty fixed the border between both states.") is None
+    assert sentence_filter.reason("See also the treatment of primary sources by later historians.") is None
+
+def test_filter_skips_exact_and_near_duplicates():
+    sentence_filter = SentenceFilter()
+    sentence = ("Software engineering is a branch of both computer science and engineering "
+                "focused on designing, developing, testing, and maintaining software applications.")
+    assert sentence_filter.reason(sentence) is None
+    assert sentence_filter.reason(sentence + " [ 1 ]") == "duplicate"
+    assert sentence_filter.reason(sentence.replace("applications", "applications today")) == "near_duplicate"
+    assert sentence_filter.reason("Learning is the process of acquiring new understanding and skills.") is None
+
+def test_filter_reports_skipped_sentences_and_saved_tokens():
+    sentence_filter = SentenceFilter()
+    records = [
+        {"sentence": "v t e"},
+        {"sentence": "History is the systematic study of the past."},
+        {"sentence": "History is the systematic study of the past."},
+    ]
+    kept = list(sentence_filter.filter(records))
+    assert kept == [records[1]]
+    assert sentence_filter.skipped == {"boilerplate": 1, "duplicate": 1}
+    assert sentence_filter.saved_tokens == estimate_tokens("v t e") + estimate_tokens(records[2]["sentence"])
+    assert sentence_filter.report().startswith("Skipped 2 of 3 sentences")
@@ -1,4 +1,5 @@
-from src.sentence_parser import split_sentences
+from src import sentence_parser
+from src.sentence_parser import split_sentences, split_many, clear_cache
 
 def test_sentence_parser():
     text = """
@@ -15,3 +16,39 @@ def test_aka_sentence_parser():
     sentences = split_sentences(text)
     expected_sentence = "Software construction typically involves programming (a.k.a. coding), unit testing, integration testing, and debugging so as to implement the design."
     assert sentences[0] == expected_sentence
+
+def test_split_many_matches_split_sentences():
+    clear_cache()
+    paragraphs = [
+        "Functional requirements describe expected behaviors (i.e. outputs). Domain requirements differ.",
+        "v t e",
+        "Functional requirements describe expected behaviors (i.e. outputs). Domain requirements differ.",
+    ]
+    assert split_many(paragraphs) == [split_sentences(p) for p in paragraphs]
+
+def test_split_many_memoizes_by_paragraph(monkeypatch):
+    clear_cache()
+    calls = []
+
+    def counting_split(text):
+        calls.append(text)
+        return split_sentences(text)
+
+    monkeypatch.setattr("src.sentence_parser.split_sentences", counting_split)
+    split_many(["Index Outline Glossary", "First. Second.", "Index Outline Glossary"])
+    split_many(["Index Outline Glossary", "Third."])
+    assert calls == ["Index Outline Glossary", "First. Second.", "Third."]
+
+def test_split_many_stays_in_process_below_threshold():
+    clear_cache()
+    sentence_parser._shutdown_pool()
+    split_many([f"Paragraph {n}. Done." for n in range(100)], workers=2)
+    assert sentence_parser._pool is None
+
+def test_split_many_in_process_pool(monkeypatch):
+    monkeypatch.setattr("src.sentence_parser.PARALLEL_THRESHOLD", 64)
+    clear_cache()
+    paragraphs = [f"Paragraph number {n} has two sentences. This is the second one." for n in range(100)]
+    results = split_many(paragraphs, workers=2)
+    assert results[42] == ["Paragraph number 42 has two sentences.", "This is the second one."]
+    assert len(results) == 100
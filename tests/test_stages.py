@@ -0,0 +1,58 @@
+import threading
+import time
+
+import pytest
+
+from src.stages import Stage, run_stages
+
+def test_run_stages_streams_items_through_every_stage():
+    stages = [
+        Stage("double", lambda n: [n * 2]),
+        Stage("explode", lambda n: [n, n + 1], workers=3),
+    ]
+    results = list(run_stages(range(5), stages))
+    assert sorted(results) == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+def test_run_stages_batches_items():
+    batches = []
+
+    def collect(batch):
+        batches.append(batch)
+        yield len(batch)
+
+    stages = [Stage("collect", collect, batch_size=4)]
+    assert sum(run_stages(range(10), stages)) == 10
+    assert all(len(batch) <= 4 for batch in batches)
+
+def test_run_stages_applies_backpressure():
+    produced = []
+    release = threading.Event()
+
+    def source():
+        for n in range(100):
+            produced.append(n)
+            yield n
+
+    def slow(n):
+        release.wait()
+        yield n
+
+    stages = [Stage("slow", slow, maxsize=2)]
+    results = run_stages(source(), stages, maxsize=2)
+    consumer = threading.Thread(target=lambda: list(results))
+    consumer.start()
+    time.sleep(0.3)
+    # Only the bounded queue plus the item in flight may be read ahead.
+    assert len(produced) <= 4
+    release.set()
+    consumer.join()
+    assert len(produced) == 100
+
+def test_run_stages_reraises_stage_errors():
+    def fail(n):
+        if n == 3:
+            raise ValueError("bad item")
+        yield n
+
+    with pytest.raises(ValueError, match="bad item"):
+        list(run_stages(range(10), [Stage("fail", fail, workers=2)]))